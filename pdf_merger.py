@@ -1,13 +1,36 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PyPDF2 import PdfReader, PdfWriter
 import fitz  # PyMuPDF
 from PIL import Image, ImageTk
 import os
 import hashlib
-from typing import List, Tuple, Dict, Set
-from dataclasses import dataclass
+import mmap
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import ClassVar, Deque, List, Optional, Tuple, Dict, Set
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
+
+# MuPDF is not thread-safe: fitz calls made off the main thread hold this lock
+_fitz_lock = threading.RLock()
+
+def _linearization_supported() -> bool:
+    """Check whether this MuPDF build can still write linearized PDFs"""
+    # PyMuPDF 1.26 dropped linearization and raises when asked for it
+    with _fitz_lock, fitz.open() as probe:
+        probe.new_page()
+        try:
+            probe.tobytes(linear=True)
+        except Exception:
+            return False
+    return True
+
+# What a background inspection hands back to the main loop: fingerprint, page
+# count, the file's full hash (if it was needed) and hashes of matching files
+_FileInfo = Tuple[Tuple[int, bytes], int, Optional[str], Dict[str, str]]
 
 class FileStatus(Enum):
     NORMAL = "normal"
@@ -17,90 +40,181 @@ class FileStatus(Enum):
 class PDFFile:
     """Represents a PDF file with metadata"""
     path: str
-    doc: fitz.Document
-    hash: str
+    fingerprint: Tuple[int, bytes]
+    hash: Optional[str] = None  # Only computed once another file shares the fingerprint
     status: FileStatus = FileStatus.NORMAL
+    page_count: int = 0
+    _doc: Optional[fitz.Document] = field(default=None, repr=False, compare=False)
+    _closed: bool = field(default=False, repr=False, compare=False)
+    _preview_cache: "OrderedDict[Tuple[int, int, int], Image.Image]" = field(
+        default_factory=OrderedDict, repr=False, compare=False)
     
-    @property
+    # Rendered pages kept per file, keyed by (page_index, canvas_w, canvas_h)
+    preview_cache_size: ClassVar[int] = 8
+    
+    # Documents are opened on demand and only the most recently used stay open
+    max_open_docs: ClassVar[int] = 4
+    _open_docs: ClassVar["OrderedDict[int, PDFFile]"] = OrderedDict()
+    
+    @cached_property
     def filename(self) -> str:
         return os.path.basename(self.path)
     
     @property
-    def page_count(self) -> int:
-        return len(self.doc)
+    def doc(self) -> fitz.Document:
+        """The MuPDF document, opened on first use"""
+        with _fitz_lock:
+            if self._closed:
+                raise ValueError(f"{self.filename} has been closed")
+            
+            if self._doc is None:
+                self._doc = fitz.open(self.path)
+            self._open_docs[id(self)] = self
+            self._open_docs.move_to_end(id(self))
+            
+            while len(self._open_docs) > self.max_open_docs:
+                _, evicted = self._open_docs.popitem(last=False)
+                evicted._doc.close()
+                evicted._doc = None
+            return self._doc
+    
+    def has_preview(self, key: Tuple[int, int, int]) -> bool:
+        """Check whether a rendered page is cached"""
+        return key in self._preview_cache
+    
+    def get_preview(self, key: Tuple[int, int, int]) -> Optional[Image.Image]:
+        """Return a cached rendered page, marking it as recently used"""
+        image = self._preview_cache.get(key)
+        if image is not None:
+            self._preview_cache.move_to_end(key)
+        return image
+    
+    def put_preview(self, key: Tuple[int, int, int], image: Image.Image):
+        """Cache a rendered page, evicting the least recently used ones"""
+        self._preview_cache[key] = image
+        self._preview_cache.move_to_end(key)
+        while len(self._preview_cache) > self.preview_cache_size:
+            self._preview_cache.popitem(last=False)
     
     def close(self):
         """Close the PDF document"""
-        self.doc.close()
+        self._preview_cache.clear()
+        with _fitz_lock:
+            self._closed = True
+            self._open_docs.pop(id(self), None)
+            if self._doc is not None:
+                self._doc.close()
+                self._doc = None
 
 class DraggableListbox(tk.Listbox):
     """Enhanced listbox with drag-and-drop reordering"""
     
+    __slots__ = ("_drag_y", "_drag_item", "_drag_index", "_pending_index", "_pending_after")
+    
     def __init__(self, master, **kw):
         super().__init__(master, **kw)
         self.bind('<Button-1>', self._on_click)
         self.bind('<B1-Motion>', self._on_drag)
         self.bind('<ButtonRelease-1>', self._on_release)
-        self._drag_data = {'y': 0, 'item': None, 'index': None}
+        self._reset_drag()
+        
+        # Motion events are coalesced to at most one move per frame (~16 ms)
+        self._pending_after = None
+    
+    def _reset_drag(self):
+        self._drag_y = 0
+        self._drag_item = None
+        self._drag_index = None
+        self._pending_index = None
         
     def _on_click(self, event):
         index = self.nearest(event.y)
         if index >= 0:
-            self._drag_data['y'] = event.y
-            self._drag_data['item'] = self.get(index)
-            self._drag_data['index'] = index
+            self._drag_y = event.y
+            self._drag_item = self.get(index)
+            self._drag_index = index
             
     def _on_drag(self, event):
-        if self._drag_data['item']:
-            new_index = self.nearest(event.y)
-            if new_index != self._drag_data['index']:
-                self.delete(self._drag_data['index'])
-                self.insert(new_index, self._drag_data['item'])
-                self._drag_data['index'] = new_index
-                self.selection_clear(0, tk.END)
-                self.selection_set(new_index)
+        if self._drag_item:
+            self._pending_index = self.nearest(event.y)
+            if self._pending_after is None:
+                self._pending_after = self.after(16, self._apply_drag)
+    
+    def _apply_drag(self):
+        self._pending_after = None
+        new_index = self._pending_index
+        if self._drag_item and new_index != self._drag_index:
+            self.delete(self._drag_index)
+            self.insert(new_index, self._drag_item)
+            self._drag_index = new_index
+            self.selection_clear(0, tk.END)
+            self.selection_set(new_index)
                 
     def _on_release(self, event):
-        if self._drag_data['item']:
+        if self._pending_after is not None:
+            self.after_cancel(self._pending_after)
+            self._apply_drag()
+        if self._drag_item:
             self.event_generate('<<ListboxReordered>>')
-        self._drag_data = {'y': 0, 'item': None, 'index': None}
+        self._reset_drag()
 
 class PDFFileManager:
     """Manages PDF files and duplicate detection"""
     
+    # Files up to this size are hashed straight from a memory map
+    mmap_hash_limit = 1 << 30
+    
     def __init__(self):
         self.files: List[PDFFile] = []
         self._hash_counts: Dict[str, int] = {}
+        self._fingerprints: Dict[Tuple[int, bytes], List[PDFFile]] = {}
     
-    def add_file(self, file_path: str) -> Tuple[bool, str]:
+    def add_file(self, file_path: str, allow_duplicate: bool = False,
+                 fingerprint: Optional[Tuple[int, bytes]] = None,
+                 file_hash: Optional[str] = None,
+                 page_count: Optional[int] = None) -> Tuple[bool, str]:
         """
         Add a PDF file to the manager
         
+        The file is only hashed in full when its fingerprint (size plus head
+        and tail bytes) matches a file that is already in the list. The
+        fingerprint, hash and page count may be computed ahead of time and
+        passed in, in which case the file is not read again.
+        
         Returns:
             Tuple[bool, str]: (success, error_message or file_hash)
         """
         try:
-            # Calculate file hash
-            file_hash = self._calculate_hash(file_path)
-            
-            # Check if file already exists
-            if self._file_exists(file_hash):
-                return False, f"File already exists: {os.path.basename(file_path)}"
+            # Cheap fingerprint first; only full-hash on a possible match
+            if fingerprint is None:
+                fingerprint = self._calculate_fingerprint(file_path)
+            candidates = self._fingerprints.get(fingerprint, [])
+            if candidates:
+                if file_hash is None:
+                    file_hash = self._calculate_hash(file_path)
+                for candidate in candidates:
+                    self._ensure_hash(candidate)
+                
+                # Check if file already exists
+                if not allow_duplicate and self._file_exists(file_hash):
+                    return False, f"File already exists: {os.path.basename(file_path)}"
             
-            # Open PDF document
-            doc = fitz.open(file_path)
-            pdf_file = PDFFile(path=file_path, doc=doc, hash=file_hash)
+            # Open PDF document; it stays open only while recently used
+            pdf_file = PDFFile(path=file_path, fingerprint=fingerprint, hash=file_hash)
+            pdf_file.page_count = len(pdf_file.doc) if page_count is None else page_count
             
             # Add to files list
             self.files.append(pdf_file)
+            self._fingerprints.setdefault(fingerprint, []).append(pdf_file)
             
             # Update hash counts
-            self._hash_counts[file_hash] = self._hash_counts.get(file_hash, 0) + 1
+            if file_hash is not None:
+                self._hash_counts[file_hash] = self._hash_counts.get(file_hash, 0) + 1
             
             # Update file statuses
             self._update_duplicate_statuses()
             
-            return True, file_hash
+            return True, file_hash or ""
             
         except Exception as e:
             return False, str(e)
@@ -111,10 +225,17 @@ class PDFFileManager:
             pdf_file = self.files.pop(index)
             pdf_file.close()
             
+            # Update fingerprint index
+            candidates = self._fingerprints[pdf_file.fingerprint]
+            candidates[:] = [f for f in candidates if f is not pdf_file]
+            if not candidates:
+                del self._fingerprints[pdf_file.fingerprint]
+            
             # Update hash counts
-            self._hash_counts[pdf_file.hash] -= 1
-            if self._hash_counts[pdf_file.hash] == 0:
-                del self._hash_counts[pdf_file.hash]
+            if pdf_file.hash is not None:
+                self._hash_counts[pdf_file.hash] -= 1
+                if self._hash_counts[pdf_file.hash] == 0:
+                    del self._hash_counts[pdf_file.hash]
             
             # Update file statuses
             self._update_duplicate_statuses()
@@ -124,12 +245,16 @@ class PDFFileManager:
     def reorder_files(self, new_order: List[str]) -> bool:
         """Reorder files based on filename list"""
         try:
+            # Files sharing a name are handed out in their current order
+            by_name: Dict[str, List[PDFFile]] = {}
+            for pdf_file in reversed(self.files):
+                by_name.setdefault(pdf_file.filename, []).append(pdf_file)
+            
             new_files = []
             for filename in new_order:
-                for pdf_file in self.files:
-                    if pdf_file.filename == filename:
-                        new_files.append(pdf_file)
-                        break
+                candidates = by_name.get(filename)
+                if candidates:
+                    new_files.append(candidates.pop())
             
             if len(new_files) == len(self.files):
                 self.files = new_files
@@ -149,7 +274,8 @@ class PDFFileManager:
         removed_count = 0
         
         for pdf_file in self.files:
-            if pdf_file.hash not in seen_hashes:
+            # Files that were never hashed have a unique fingerprint
+            if pdf_file.hash is None or pdf_file.hash not in seen_hashes:
                 seen_hashes.add(pdf_file.hash)
                 files_to_keep.append(pdf_file)
             else:
@@ -158,19 +284,52 @@ class PDFFileManager:
         
         self.files = files_to_keep
         self._hash_counts = {}
+        self._fingerprints = {}
         for pdf_file in self.files:
-            self._hash_counts[pdf_file.hash] = self._hash_counts.get(pdf_file.hash, 0) + 1
+            self._fingerprints.setdefault(pdf_file.fingerprint, []).append(pdf_file)
+            if pdf_file.hash is not None:
+                self._hash_counts[pdf_file.hash] = self._hash_counts.get(pdf_file.hash, 0) + 1
         
         self._update_duplicate_statuses()
         return removed_count
     
+    def _calculate_fingerprint(self, file_path: str) -> Tuple[int, bytes]:
+        """Calculate a cheap fingerprint: file size plus its first and last 4 KiB"""
+        size = os.path.getsize(file_path)
+        with open(file_path, "rb") as f:
+            probe = f.read(4096)
+            if size > 8192:
+                f.seek(size - 4096)
+            probe += f.read(4096)
+        return size, probe
+    
+    def _ensure_hash(self, pdf_file: PDFFile, file_hash: Optional[str] = None):
+        """Compute (or record a precomputed) full hash of a file added without one"""
+        if pdf_file.hash is None:
+            pdf_file.hash = file_hash or self._calculate_hash(pdf_file.path)
+            self._hash_counts[pdf_file.hash] = self._hash_counts.get(pdf_file.hash, 0) + 1
+    
     def _calculate_hash(self, file_path: str) -> str:
-        """Calculate MD5 hash of file"""
-        hash_md5 = hashlib.md5()
+        """Calculate SHA-256 hash of file"""
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            # One sequential pass over a mapping lets the kernel read ahead and
+            # hashlib digest the whole file in a single call
+            size = os.fstat(f.fileno()).st_size
+            if 0 < size <= self.mmap_hash_limit:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return hashlib.sha256(mm).hexdigest()
+                except (OSError, ValueError):
+                    pass  # Fall back to buffered reads
+            
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            
+            # Python < 3.11: read in large chunks to keep syscalls down
+            hash_sha256 = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hash_sha256.update(chunk)
+            return hash_sha256.hexdigest()
     
     def _file_exists(self, file_hash: str) -> bool:
         """Check if file with given hash already exists"""
@@ -179,7 +338,7 @@ class PDFFileManager:
     def _update_duplicate_statuses(self):
         """Update status of all files based on hash counts"""
         for pdf_file in self.files:
-            if self._hash_counts[pdf_file.hash] > 1:
+            if pdf_file.hash is not None and self._hash_counts[pdf_file.hash] > 1:
                 pdf_file.status = FileStatus.DUPLICATE
             else:
                 pdf_file.status = FileStatus.NORMAL
@@ -202,6 +361,28 @@ class PDFMergerGUI:
         self.current_preview_index = -1
         self.current_preview_page = 1
         
+        # Duplicate status last drawn for each listbox row
+        self._row_states: List[FileStatus] = []
+        
+        # Pages are rasterized off the Tk main loop: the displayed page on the
+        # render pool, neighbouring pages on the prefetch pool
+        self._render_pool = ThreadPoolExecutor(max_workers=1)
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        self._pending_gen = 0
+        self._pending_render: Optional[Future] = None
+        self._last_nav_ts = 0.0
+        
+        # Files being added, fingerprinted off the main loop
+        self._hash_pool = ThreadPoolExecutor()
+        self._pending_adds: Deque[Tuple[str, Future]] = deque()
+        self._draining_adds = False
+        
+        # Merging runs on its own worker so it never queues behind renders
+        self._merge_pool = ThreadPoolExecutor(max_workers=1)
+        self._merging = False
+        self._prefetching: Set[Tuple[int, Tuple[int, int, int]]] = set()
+        self._prefetch_futures: List[Future] = []
+        
         # Create GUI
         self._create_gui()
         
@@ -242,8 +423,9 @@ class PDFMergerGUI:
         self.files_listbox.bind('<<ListboxReordered>>', self._on_files_reordered)
         
         # Remove button
-        ttk.Button(control_frame, text="Remove Selected", command=self._remove_selected).grid(
-            row=3, column=0, pady=5, sticky="ew")
+        self.remove_btn = ttk.Button(
+            control_frame, text="Remove Selected", command=self._remove_selected)
+        self.remove_btn.grid(row=3, column=0, pady=5, sticky="ew")
         
         # Remove duplicates button
         self.remove_duplicates_btn = ttk.Button(
@@ -252,8 +434,22 @@ class PDFMergerGUI:
         self.remove_duplicates_btn.grid(row=4, column=0, pady=5, sticky="ew")
         
         # Merge button
-        ttk.Button(control_frame, text="Merge PDFs", command=self._merge_pdfs).grid(
-            row=5, column=0, pady=20, sticky="ew")
+        self.merge_btn = ttk.Button(control_frame, text="Merge PDFs", command=self._merge_pdfs)
+        self.merge_btn.grid(row=5, column=0, pady=(20, 5), sticky="ew")
+        
+        # Linearized output lets viewers show the first pages before the
+        # whole file has downloaded; the option is greyed out where MuPDF
+        # no longer supports it
+        can_linearize = _linearization_supported()
+        self.linearize_var = tk.BooleanVar(value=can_linearize)
+        ttk.Checkbutton(control_frame, text="Optimize for fast web view",
+                        variable=self.linearize_var,
+                        state="normal" if can_linearize else "disabled").grid(
+            row=6, column=0, pady=5, sticky="w")
+        
+        # Merge progress
+        self.merge_progress = ttk.Progressbar(control_frame, mode="determinate")
+        self.merge_progress.grid(row=7, column=0, pady=5, sticky="ew")
     
     def _create_preview_panel(self, parent):
         """Create the right preview panel"""
@@ -266,6 +462,12 @@ class PDFMergerGUI:
         self.preview_canvas = tk.Canvas(preview_frame, width=600, height=600, bg='white')
         self.preview_canvas.grid(row=0, column=0, columnspan=3, sticky="nsew")
         
+        # One canvas-sized buffer and PhotoImage, updated in place for every page
+        self._preview_buffer = Image.new("RGB", (600, 600), "white")
+        self._preview_photo = ImageTk.PhotoImage(self._preview_buffer)
+        self._canvas_img_id = self.preview_canvas.create_image(
+            600//2, 600//2, image=self._preview_photo, anchor="center")
+        
         # Navigation frame
         nav_frame = ttk.Frame(preview_frame)
         nav_frame.grid(row=1, column=0, columnspan=3, pady=5)
@@ -279,52 +481,152 @@ class PDFMergerGUI:
         """Add PDF files to the list"""
         file_paths = filedialog.askopenfilenames(filetypes=[("PDF files", "*.pdf")])
         
+        # Inspect concurrently; files are still added in selection order
         for path in file_paths:
-            success, result = self.file_manager.add_file(path)
-            
-            if not success:
-                if "already exists" in result:
-                    # Ask user if they want to add duplicate
-                    filename = os.path.basename(path)
-                    if messagebox.askyesno("Duplicate File", 
-                                         f"File '{filename}' already exists.\n\nAdd it anyway?"):
-                        # Force add by temporarily removing the hash check
-                        self._force_add_file(path)
-                else:
-                    messagebox.showerror("Error", f"Failed to load {path}: {result}")
+            self._queue_add(path, self._hash_pool.submit(self._inspect_file, path))
+    
+    def _queue_add(self, path: str, future: Future, first: bool = False):
+        """Track a background file inspection and drain the queue when it finishes"""
+        if first:
+            self._pending_adds.appendleft((path, future))
+        else:
+            self._pending_adds.append((path, future))
+        future.add_done_callback(lambda f: self.root.after(0, self._drain_pending_adds))
+    
+    def _inspect_file(self, path: str, fingerprint: Optional[Tuple[int, bytes]] = None,
+                      page_count: Optional[int] = None,
+                      hash_paths: Optional[Tuple[str, ...]] = None) -> _FileInfo:
+        """
+        Read everything add_file needs from a file (runs on the hash pool)
+        
+        The fingerprint and page count are always taken. The file itself and
+        the listed files are hashed in full only when asked for, which is
+        once the main loop has seen the fingerprint match a listed file.
+        """
+        manager = self.file_manager
+        if fingerprint is None:
+            fingerprint = manager._calculate_fingerprint(path)
+        if page_count is None:
+            with _fitz_lock, fitz.open(path) as doc:
+                page_count = len(doc)
+        
+        file_hash = None
+        hashes: Dict[str, str] = {}
+        if hash_paths is not None:
+            file_hash = manager._calculate_hash(path)
+            # Re-adding a listed file needs only the one pass
+            hashes = {other: file_hash if other == path else manager._calculate_hash(other)
+                      for other in hash_paths}
+        return fingerprint, page_count, file_hash, hashes
+    
+    def _drain_pending_adds(self):
+        """Add every file at the head of the queue whose inspection is ready"""
+        # A duplicate prompt runs a nested event loop; let the outer call finish
+        if self._draining_adds:
+            return
+        
+        self._draining_adds = True
+        try:
+            while self._pending_adds and self._pending_adds[0][1].done():
+                path, future = self._pending_adds.popleft()
+                try:
+                    fingerprint, page_count, file_hash, hashes = future.result()
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to load {path}: {str(e)}")
+                    continue
+                
+                # Record the hashes of listed files that were read alongside
+                candidates = self.file_manager._fingerprints.get(fingerprint, [])
+                for candidate in candidates:
+                    if candidate.path in hashes:
+                        self.file_manager._ensure_hash(candidate, hashes[candidate.path])
+                
+                # A possible duplicate is hashed, with the files it may match,
+                # off the main loop before it is added
+                unhashed = tuple(c.path for c in candidates if c.hash is None)
+                if candidates and (file_hash is None or unhashed):
+                    future = self._hash_pool.submit(
+                        self._inspect_file, path, fingerprint, page_count, unhashed)
+                    self._queue_add(path, future, first=True)
+                    break
+                
+                self._on_fingerprinted(path, fingerprint, file_hash, page_count)
+        finally:
+            self._draining_adds = False
+    
+    def _on_fingerprinted(self, path: str, fingerprint: Tuple[int, bytes],
+                          file_hash: Optional[str], page_count: int):
+        """Add a file that was inspected in the background"""
+        success, result = self.file_manager.add_file(
+            path, fingerprint=fingerprint, file_hash=file_hash, page_count=page_count)
+        
+        if success:
+            self._append_file_row()
+        else:
+            if "already exists" in result:
+                # Ask user if they want to add duplicate
+                filename = os.path.basename(path)
+                if messagebox.askyesno("Duplicate File", 
+                                     f"File '{filename}' already exists.\n\nAdd it anyway?"):
+                    # Force add by temporarily removing the hash check
+                    self._force_add_file(path, fingerprint, file_hash, page_count)
             else:
-                self._refresh_file_list()
+                messagebox.showerror("Error", f"Failed to load {path}: {result}")
     
-    def _force_add_file(self, path: str):
+    def _force_add_file(self, path: str, fingerprint: Tuple[int, bytes],
+                        file_hash: Optional[str], page_count: int):
         """Force add a file even if it's a duplicate"""
-        try:
-            doc = fitz.open(path)
-            file_hash = self.file_manager._calculate_hash(path)
-            pdf_file = PDFFile(path=path, doc=doc, hash=file_hash)
-            
-            self.file_manager.files.append(pdf_file)
-            self.file_manager._hash_counts[file_hash] = self.file_manager._hash_counts.get(file_hash, 0) + 1
-            self.file_manager._update_duplicate_statuses()
-            
-            self._refresh_file_list()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load {path}: {str(e)}")
+        success, result = self.file_manager.add_file(
+            path, allow_duplicate=True, fingerprint=fingerprint,
+            file_hash=file_hash, page_count=page_count)
+        if success:
+            self._append_file_row()
+        else:
+            messagebox.showerror("Error", f"Failed to load {path}: {result}")
     
     def _refresh_file_list(self):
         """Refresh the file listbox display"""
         self.files_listbox.delete(0, tk.END)
+        self._row_states = []
         
         for i, pdf_file in enumerate(self.file_manager.files):
             display_text = f"{pdf_file.filename} ({pdf_file.page_count} pages)"
             self.files_listbox.insert(tk.END, display_text)
+            self._row_states.append(pdf_file.status)
             
             # Color duplicate files
             if pdf_file.status == FileStatus.DUPLICATE:
                 self.files_listbox.itemconfig(i, {'bg': '#ffcccc'})
         
-        # Update remove duplicates button
+        self._update_remove_duplicates_btn()
+    
+    def _append_file_row(self):
+        """Show the file the manager just appended without rebuilding the list"""
+        pdf_file = self.file_manager.files[-1]
+        self.files_listbox.insert(tk.END, f"{pdf_file.filename} ({pdf_file.page_count} pages)")
+        self._row_states.append(FileStatus.NORMAL)
+        self._sync_row_states()
+    
+    def _remove_file_row(self, index: int):
+        """Drop a removed file's row without rebuilding the list"""
+        self.files_listbox.delete(index)
+        del self._row_states[index]
+        self._sync_row_states()
+    
+    def _sync_row_states(self):
+        """Recolor only the rows whose duplicate status changed"""
+        for i, pdf_file in enumerate(self.file_manager.files):
+            if self._row_states[i] != pdf_file.status:
+                self._row_states[i] = pdf_file.status
+                bg = '#ffcccc' if pdf_file.status == FileStatus.DUPLICATE else ''
+                self.files_listbox.itemconfig(i, {'bg': bg})
+        
+        self._update_remove_duplicates_btn()
+    
+    def _update_remove_duplicates_btn(self):
+        """Enable Remove Duplicates only while duplicates are listed"""
         duplicate_count = len(self.file_manager.get_duplicate_files())
-        if duplicate_count > 0:
+        if duplicate_count > 0 and not self._merging:
             self.remove_duplicates_btn.config(state="normal")
         else:
             self.remove_duplicates_btn.config(state="disabled")
@@ -335,7 +637,7 @@ class PDFMergerGUI:
         if selection:
             index = selection[0]
             if self.file_manager.remove_file(index):
-                self._refresh_file_list()
+                self._remove_file_row(index)
                 
                 # Update preview if necessary
                 if not self.file_manager.files:
@@ -379,60 +681,213 @@ class PDFMergerGUI:
     
     def _on_files_reordered(self, event):
         """Handle file reordering"""
-        new_order = []
-        for i in range(self.files_listbox.size()):
-            filename = self.files_listbox.get(i).split(" (")[0]
-            new_order.append(filename)
+        # Strip the " (N pages)" suffix added by _refresh_file_list
+        new_order = [row.rsplit(" (", 1)[0] for row in self.files_listbox.get(0, tk.END)]
         
         if self.file_manager.reorder_files(new_order):
             self._refresh_file_list()
     
-    def _update_preview(self):
-        """Update the preview display"""
+    def _update_preview(self, draft: bool = False):
+        """Update the preview display, at low resolution first if draft is set"""
         if (self.current_preview_index < 0 or 
             self.current_preview_index >= len(self.file_manager.files)):
             return
         
-        try:
-            pdf_file = self.file_manager.files[self.current_preview_index]
-            page = pdf_file.doc[self.current_preview_page - 1]
-            pix = page.get_pixmap(matrix=fitz.Matrix(1.5, 1.5))
-            
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            
-            # Scale image to fit canvas
-            canvas_width = 600
-            canvas_height = 600
-            scale = min(canvas_width/img.width, canvas_height/img.height)
-            new_width = int(img.width * scale)
-            new_height = int(img.height * scale)
-            
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            self.preview_image = ImageTk.PhotoImage(img)
-            
-            self.preview_canvas.delete("all")
-            self.preview_canvas.create_image(
-                canvas_width//2, canvas_height//2, 
-                image=self.preview_image, anchor="center")
+        # Any render still in flight is now stale
+        self._pending_gen += 1
+        self._cancel_pending_render()
+        self._cancel_prefetches()
+        
+        pdf_file = self.file_manager.files[self.current_preview_index]
+        page_index = self.current_preview_page - 1
+        canvas_width = 600
+        canvas_height = 600
+        cache_key = (page_index, canvas_width, canvas_height)
+        
+        preview = pdf_file.get_preview(cache_key)
+        if preview is not None:
+            self._show_preview(pdf_file, preview)
+        elif draft:
+            self._submit_preview(pdf_file, cache_key, quality="draft")
+            self.root.after(200, self._refine_preview, pdf_file, cache_key, self._pending_gen)
+        else:
+            self._submit_preview(pdf_file, cache_key)
+    
+    def _refine_preview(self, pdf_file: PDFFile, cache_key: Tuple[int, int, int],
+                        generation: int):
+        """Replace a draft preview with a full render once navigation settles"""
+        if generation == self._pending_gen and not pdf_file.has_preview(cache_key):
+            self._submit_preview(pdf_file, cache_key)
+    
+    def _submit_preview(self, pdf_file: PDFFile, cache_key: Tuple[int, int, int],
+                        quality: str = "full"):
+        """Rasterize a page on the render worker and display it when done"""
+        generation = self._pending_gen
+        page_index, canvas_width, canvas_height = cache_key
+        
+        # A draft still queued for this page is superseded by the full render
+        self._cancel_pending_render()
+        future = self._render_pool.submit(
+            self._render_page, pdf_file, page_index, canvas_width, canvas_height, quality)
+        self._pending_render = future
+        future.add_done_callback(
+            lambda f: self.root.after(
+                0, self._apply_preview, f, pdf_file, cache_key, generation, quality))
+    
+    def _cancel_pending_render(self):
+        """Drop the queued render of a page that is no longer wanted"""
+        # Otherwise every page skipped while paging renders before the one
+        # the user stops on
+        if self._pending_render is not None:
+            self._pending_render.cancel()
+            self._pending_render = None
+    
+    def _render_page(self, pdf_file: PDFFile, page_index: int,
+                     canvas_width: int, canvas_height: int,
+                     quality: str = "full") -> Image.Image:
+        """
+        Render a page scaled to fit the canvas (runs on a render worker)
+        
+        A "draft" render rasterizes at half resolution and is blown up with
+        nearest-neighbour resampling, which is much cheaper than a full render.
+        """
+        with _fitz_lock:
+            page = pdf_file.doc[page_index]
             
-            self.page_label.config(text=f"Page: {self.current_preview_page}/{pdf_file.page_count}")
+            # Rasterize straight at canvas resolution so no resample is needed
+            page_rect = page.rect
+            scale = min(canvas_width/page_rect.width, canvas_height/page_rect.height)
+            if quality != "draft":
+                pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+                return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
             
+            pix = page.get_pixmap(matrix=fitz.Matrix(scale * 0.5, scale * 0.5), alpha=False)
+            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        
+        size = (int(page_rect.width * scale), int(page_rect.height * scale))
+        return img.resize(size, Image.Resampling.NEAREST)
+    
+    def _apply_preview(self, future, pdf_file: PDFFile, cache_key: Tuple[int, int, int],
+                       generation: int, quality: str = "full"):
+        """Install a finished render (runs on the Tk main loop)"""
+        if future.cancelled():
+            return
+        if future is self._pending_render:
+            self._pending_render = None
+        
+        try:
+            preview = future.result()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to update preview: {str(e)}")
+            if generation == self._pending_gen:
+                messagebox.showerror("Error", f"Failed to update preview: {str(e)}")
+            return
+        
+        if quality == "full":
+            pdf_file.put_preview(cache_key, preview)
+        
+        if generation == self._pending_gen:
+            self._show_preview(pdf_file, preview, prefetch=quality == "full")
+        
+        # Keep MuPDF's resource store from growing with every page viewed.
+        # Once per displayed page, not per prefetch, so the fonts and images
+        # neighbouring pages share stay cached; the worker takes the lock.
+        if quality == "full" and generation == self._pending_gen:
+            self._render_pool.submit(self._shrink_store, 25)
+    
+    def _shrink_store(self, percent: int):
+        """Trim MuPDF's resource store by percent"""
+        # TOOLS has changed across PyMuPDF releases; a missing knob is not fatal
+        try:
+            with _fitz_lock:
+                fitz.TOOLS.store_shrink(percent)
+        except Exception:
+            pass
+    
+    def _show_preview(self, pdf_file: PDFFile, preview: Image.Image, prefetch: bool = True):
+        """Draw a rendered page on the preview canvas"""
+        # Centre the page in the shared buffer and blit it into the PhotoImage
+        # the canvas already displays; nothing is reallocated per page
+        width, height = preview.size
+        self._preview_buffer.paste("white", (0, 0, 600, 600))
+        self._preview_buffer.paste(preview, ((600 - width)//2, (600 - height)//2))
+        self._preview_photo.paste(self._preview_buffer)
+        
+        self.page_label.config(text=f"Page: {self.current_preview_page}/{pdf_file.page_count}")
+        
+        # Draft frames mean the user is still paging; prefetching around them
+        # would only compete with the render of the page they stop on
+        if prefetch:
+            self.root.after_idle(self._prefetch_neighbors, pdf_file,
+                                 self.current_preview_page - 1, self._pending_gen)
+    
+    def _prefetch_neighbors(self, pdf_file: PDFFile, page_index: int, generation: int,
+                            radius: int = 2):
+        """Warm the preview cache with the pages around the displayed one"""
+        if (generation != self._pending_gen or
+            self.current_preview_index < 0 or
+            self.current_preview_index >= len(self.file_manager.files) or
+            self.file_manager.files[self.current_preview_index] is not pdf_file):
+            return
+        
+        first = max(0, page_index - radius)
+        last = min(pdf_file.page_count - 1, page_index + radius)
+        for neighbor in range(first, last + 1):
+            cache_key = (neighbor, 600, 600)
+            pending_key = (id(pdf_file), cache_key)
+            if (neighbor == page_index or pdf_file.has_preview(cache_key) or
+                pending_key in self._prefetching):
+                continue
+            
+            self._prefetching.add(pending_key)
+            future = self._prefetch_pool.submit(
+                self._render_page, pdf_file, neighbor, 600, 600)
+            future.add_done_callback(
+                lambda f, key=cache_key: self.root.after(
+                    0, self._store_prefetched, f, pdf_file, key))
+            self._prefetch_futures.append(future)
+    
+    def _cancel_prefetches(self):
+        """Drop queued prefetches around a page the user has moved away from"""
+        # Renders already running finish and are cached as usual
+        for future in self._prefetch_futures:
+            future.cancel()
+        self._prefetch_futures = []
+    
+    def _store_prefetched(self, future, pdf_file: PDFFile, cache_key: Tuple[int, int, int]):
+        """Cache a prefetched page without displaying it"""
+        self._prefetching.discard((id(pdf_file), cache_key))
+        if future.cancelled():
+            return
+        try:
+            pdf_file.put_preview(cache_key, future.result())
+        except Exception:
+            # Prefetching is best-effort; the page renders on demand instead
+            pass
     
     def _clear_preview(self):
         """Clear the preview display"""
+        self._pending_gen += 1
+        self._cancel_pending_render()
+        self._cancel_prefetches()
         self.current_preview_index = -1
         self.current_preview_page = 1
-        self.preview_canvas.delete("all")
+        self._preview_buffer.paste("white", (0, 0, 600, 600))
+        self._preview_photo.paste(self._preview_buffer)
         self.page_label.config(text="Page: 0/0")
     
+    def _is_rapid_navigation(self) -> bool:
+        """Record a page turn and report whether it followed the last one closely"""
+        now = time.monotonic()
+        rapid = now - self._last_nav_ts < 0.15
+        self._last_nav_ts = now
+        return rapid
+    
     def _prev_page(self):
         """Go to previous page"""
         if (self.current_preview_index >= 0 and 
             self.current_preview_page > 1):
             self.current_preview_page -= 1
-            self._update_preview()
+            self._update_preview(draft=self._is_rapid_navigation())
     
     def _next_page(self):
         """Go to next page"""
@@ -440,7 +895,7 @@ class PDFMergerGUI:
             pdf_file = self.file_manager.files[self.current_preview_index]
             if self.current_preview_page < pdf_file.page_count:
                 self.current_preview_page += 1
-                self._update_preview()
+                self._update_preview(draft=self._is_rapid_navigation())
     
     def _merge_pdfs(self):
         """Merge all PDF files"""
@@ -453,24 +908,66 @@ class PDFMergerGUI:
             filetypes=[("PDF files", "*.pdf")])
         
         if output_path:
-            try:
-                pdf_writer = PdfWriter()
-                
-                for pdf_file in self.file_manager.files:
-                    pdf_reader = PdfReader(pdf_file.path)
-                    for page in pdf_reader.pages:
-                        pdf_writer.add_page(page)
-                
-                with open(output_path, 'wb') as output_file:
-                    pdf_writer.write(output_file)
-                
-                messagebox.showinfo("Success", "PDFs merged successfully!")
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            paths = [pdf_file.path for pdf_file in self.file_manager.files]
+            self._set_merging(True)
+            
+            # One step per source file plus one for the save
+            self.merge_progress.config(maximum=len(paths) + 1, value=0)
+            
+            future = self._merge_pool.submit(
+                self._do_merge, paths, output_path, self.linearize_var.get())
+            future.add_done_callback(lambda f: self.root.after(0, self._on_merge_done, f))
+    
+    def _do_merge(self, paths: List[str], output_path: str, linear: bool = False):
+        """Merge the given files into output_path (runs on the merge worker)"""
+        # MuPDF splices the page trees in C; garbage=4 also dedupes objects
+        # shared between the merged files. Sources are opened one at a time
+        # so a merge never holds every document open.
+        with _fitz_lock:
+            out = fitz.open()
+        try:
+            for i, path in enumerate(paths, 1):
+                with _fitz_lock, fitz.open(path) as src:
+                    out.insert_pdf(src)
+                self.root.after(0, lambda value=i: self.merge_progress.config(value=value))
+            
+            # Saving to a path streams straight into the file rather than
+            # building the whole output as a bytes object first
+            with _fitz_lock:
+                out.save(output_path, garbage=4, deflate=True, clean=True, linear=linear)
+        finally:
+            # Release the assembled document even if a source or the save fails
+            with _fitz_lock:
+                out.close()
+    
+    def _set_merging(self, merging: bool):
+        """Lock out list edits while a merge holds the fitz lock"""
+        # Removing files closes documents under the same lock, which would
+        # stall the main loop until the merge finished. Adding stays enabled:
+        # new files are inspected on the hash pool, which waits instead.
+        self._merging = merging
+        state = "disabled" if merging else "normal"
+        for button in (self.merge_btn, self.remove_btn):
+            button.config(state=state)
+        self._update_remove_duplicates_btn()
+    
+    def _on_merge_done(self, future):
+        """Report the outcome of a background merge"""
+        self._set_merging(False)
+        self.merge_progress.config(value=0)
+        
+        try:
+            future.result()
+            messagebox.showinfo("Success", "PDFs merged successfully!")
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
     
     def __del__(self):
         """Cleanup when object is destroyed"""
+        self._prefetch_pool.shutdown(wait=False)
+        self._render_pool.shutdown(wait=True)
+        self._merge_pool.shutdown(wait=True)
+        self._hash_pool.shutdown(wait=False)
         self.file_manager.close_all()
 
 def main():
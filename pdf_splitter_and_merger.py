@@ -1,8 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PyPDF2 import PdfReader, PdfWriter
 import fitz  # PyMuPDF
-from PIL import Image, ImageTk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import math
+import threading
+
+# MuPDF is not thread-safe, so every fitz call made by the render worker holds this lock
+_fitz_lock = threading.RLock()
+
+@lru_cache(maxsize=64)
+def _matrix(scale):
+    # Pages of one document mostly share a size, so the same few scales recur
+    return fitz.Matrix(scale, scale)
 
 class DraggableListbox(tk.Listbox):
     def __init__(self, master, **kw):
@@ -10,7 +21,10 @@ class DraggableListbox(tk.Listbox):
         self.bind('<Button-1>', self.on_click)
         self.bind('<B1-Motion>', self.on_drag)
         self.bind('<ButtonRelease-1>', self.on_release)
-        self.drag_data = {'y': 0, 'item': None, 'index': None}
+        self.drag_data = {'y': 0, 'item': None, 'index': None, 'target_index': None}
+        
+        # (from_index, to_index) of the latest move, read by <<ListboxReordered>> handlers
+        self.last_move = None
         
     def on_click(self, event):
         index = self.nearest(event.y)
@@ -18,21 +32,33 @@ class DraggableListbox(tk.Listbox):
             self.drag_data['y'] = event.y
             self.drag_data['item'] = self.get(index)
             self.drag_data['index'] = index
+            self.drag_data['target_index'] = index
             
     def on_drag(self, event):
+        # Only highlight the drop row here; the list itself changes once, on release
         if self.drag_data['item']:
             new_index = self.nearest(event.y)
-            if new_index != self.drag_data['index']:
-                self.delete(self.drag_data['index'])
-                self.insert(new_index, self.drag_data['item'])
-                self.drag_data['index'] = new_index
-                self.selection_clear(0, tk.END)
-                self.selection_set(new_index)
+            target_index = self.drag_data['target_index']
+            if new_index != target_index:
+                if target_index != self.drag_data['index']:
+                    self.itemconfig(target_index, background='')
+                if new_index != self.drag_data['index']:
+                    self.itemconfig(new_index, background='#cde')
+                self.drag_data['target_index'] = new_index
                 
     def on_release(self, event):
         if self.drag_data['item']:
-            self.event_generate('<<ListboxReordered>>')
-        self.drag_data = {'y': 0, 'item': None, 'index': None}
+            index = self.drag_data['index']
+            target_index = self.drag_data['target_index']
+            if target_index != index:
+                self.itemconfig(target_index, background='')
+                self.delete(index)
+                self.insert(target_index, self.drag_data['item'])
+                self.selection_clear(0, tk.END)
+                self.selection_set(target_index)
+                self.last_move = (index, target_index)
+                self.event_generate('<<ListboxReordered>>')
+        self.drag_data = {'y': 0, 'item': None, 'index': None, 'target_index': None}
 
 class PDFSplitterGUI:
     def __init__(self, root):
@@ -47,6 +73,16 @@ class PDFSplitterGUI:
         self.doc = None
         self.goto_page_var = tk.StringVar()
         
+        # Rendered pages keyed by (page, canvas_w, canvas_h), least recently used first
+        self._preview_cache = OrderedDict()
+        self._preview_cache_size = 32
+        
+        # Pages render off the Tk thread; rapid navigation is coalesced first
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_render = None
+        self._render_after = None
+        self._prefetching = set()
+        
         self.create_gui()
         
     def create_gui(self):
@@ -88,6 +124,10 @@ class PDFSplitterGUI:
         self.preview_canvas = tk.Canvas(preview_frame, width=600, height=600, bg='white')
         self.preview_canvas.grid(row=0, column=0, columnspan=4)
         
+        # One canvas-sized PhotoImage is reused for every page
+        self._preview_tk = tk.PhotoImage(width=600, height=600)
+        self.preview_canvas.create_image(300, 300, image=self._preview_tk, anchor="center")
+        
         nav_frame = ttk.Frame(preview_frame)
         nav_frame.grid(row=1, column=0, columnspan=4, pady=5)
         
@@ -103,99 +143,190 @@ class PDFSplitterGUI:
         
         goto_entry.bind('<Return>', lambda e: self.goto_page())
 
+    def _format_range(self, start, end):
+        # Rows are display-only; self.page_ranges is the source of truth
+        return f"Pages {start} to {end}"
+        
     def on_ranges_reordered(self, event):
-        new_ranges = []
-        for i in range(self.ranges_listbox.size()):
-            item = self.ranges_listbox.get(i)
-            parts = item.split()
-            start = int(parts[1])
-            end = int(parts[3])
-            new_ranges.append((start, end))
-        self.page_ranges = new_ranges
+        # Apply the same move to the tuples instead of re-parsing the row labels
+        from_index, to_index = self.ranges_listbox.last_move
+        self.page_ranges.insert(to_index, self.page_ranges.pop(from_index))
         
     def goto_page(self):
-        try:
-            page_num = int(self.goto_page_var.get())
-            if 1 <= page_num <= self.total_pages:
-                self.current_preview_page = page_num
-                self.update_preview()
-            else:
-                messagebox.showerror("Error", f"Please enter a page number between 1 and {self.total_pages}")
-        except ValueError:
+        page_str = self.goto_page_var.get().strip()
+        if not page_str.isdecimal():
             messagebox.showerror("Error", "Please enter a valid page number")
+        elif 1 <= int(page_str) <= self.total_pages:
+            self.current_preview_page = int(page_str)
+            self._schedule_render()
+        else:
+            messagebox.showerror("Error", f"Please enter a page number between 1 and {self.total_pages}")
         self.goto_page_var.set("")
         
     def load_pdf(self):
         file_path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
         if file_path:
             try:
+                with _fitz_lock:
+                    new_doc = fitz.open(file_path)
+                    
+                    # Release the previous document instead of leaving it to the GC
+                    if self.doc:
+                        self.doc.close()
+                
                 self.current_pdf_path = file_path
-                self.doc = fitz.open(file_path)
+                self.doc = new_doc
                 self.total_pages = len(self.doc)
                 self.current_preview_page = 1
                 self.page_ranges = []
                 self.ranges_listbox.delete(0, tk.END)
+                self._preview_cache.clear()
+                self._prefetching.clear()
+                self._shrink_store(100)
                 self.update_preview()
                 messagebox.showinfo("Success", f"Loaded PDF with {self.total_pages} pages")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load PDF: {str(e)}")
             
+    def _shrink_store(self, percent):
+        # TOOLS has changed across PyMuPDF releases; a missing knob is not fatal
+        try:
+            with _fitz_lock:
+                fitz.TOOLS.store_shrink(percent)
+        except Exception:
+            pass
+            
     def update_preview(self):
         if not self.doc:
             return
             
-        try:
-            page = self.doc[self.current_preview_page - 1]
-            pix = page.get_pixmap(matrix=fitz.Matrix(1.5, 1.5))
-            
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            
-            canvas_width = 600
-            canvas_height = 600
-            
-            scale = min(canvas_width/img.width, canvas_height/img.height)
-            new_width = int(img.width * scale)
-            new_height = int(img.height * scale)
-            
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            self.preview_image = ImageTk.PhotoImage(img)
+        canvas_width = 600
+        canvas_height = 600
+        cache_key = (self.current_preview_page, canvas_width, canvas_height)
+        
+        if cache_key in self._preview_cache:
+            self._preview_cache.move_to_end(cache_key)
+            self._show_preview(self._preview_cache[cache_key])
+            return
+        
+        # A prefetch of this page is already running and will display it
+        if cache_key in self._prefetching:
+            return
+        
+        # Drop a queued render for a page the user has already left
+        if self._pending_render is not None:
+            self._pending_render.cancel()
+        
+        doc = self.doc
+        future = self._executor.submit(self._render_page, doc, self.current_preview_page,
+                                       canvas_width, canvas_height)
+        self._pending_render = future
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._apply_pixmap, f, doc, cache_key))
+        
+    def _render_page(self, doc, page_num, canvas_width, canvas_height):
+        with _fitz_lock:
+            page = doc[page_num - 1]
             
-            self.preview_canvas.delete("all")
-            self.preview_canvas.create_image(canvas_width//2, canvas_height//2, 
-                                          image=self.preview_image, anchor="center")
+            # Let MuPDF rasterize at the size the canvas shows, keeping the aspect
+            # ratio; an opaque RGB pixmap needs no alpha channel and maps to PPM as-is.
+            # The scale is rounded down for the matrix cache so the page never
+            # outgrows the canvas.
+            scale = min(canvas_width/page.rect.width, canvas_height/page.rect.height)
+            pix = page.get_pixmap(matrix=_matrix(math.floor(scale * 1000) / 1000), colorspace=fitz.csRGB,
+                                  clip=None, alpha=False)
+            ppm, width, height = pix.tobytes("ppm"), pix.width, pix.height
+            del pix, page
             
-            self.page_label.config(text=f"Page: {self.current_preview_page}/{self.total_pages}")
+            # Trim MuPDF's resource store so long browsing sessions stay flat
+            self._shrink_store(20)
+            return ppm, width, height
+        
+    def _apply_pixmap(self, future, doc, cache_key):
+        if future.cancelled() or doc is not self.doc:
+            return
+        self._prefetching.discard(cache_key)
+        if future is self._pending_render:
+            self._pending_render = None
             
+        try:
+            preview_image = future.result()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to update preview: {str(e)}")
+            if cache_key[0] == self.current_preview_page:
+                messagebox.showerror("Error", f"Failed to update preview: {str(e)}")
+            return
+        
+        self._preview_cache[cache_key] = preview_image
+        while len(self._preview_cache) > self._preview_cache_size:
+            self._preview_cache.popitem(last=False)
+        
+        if cache_key[0] == self.current_preview_page:
+            self._show_preview(preview_image)
+            
+    def _show_preview(self, preview_image):
+        # Decode the PPM centred into the PhotoImage the canvas already shows;
+        # blanked pixels let the white canvas show through
+        ppm, width, height = preview_image
+        self._preview_tk.blank()
+        self._preview_tk.put(ppm, to=(max(0, (600 - width) // 2), max(0, (600 - height) // 2)))
+        
+        self.page_label.config(text=f"Page: {self.current_preview_page}/{self.total_pages}")
+        
+        self._prefetch(self.current_preview_page + 1)
+        self._prefetch(self.current_preview_page - 1)
+        
+    def _prefetch(self, page_num):
+        # Warm the cache with a neighbouring page so Previous/Next hit it
+        cache_key = (page_num, 600, 600)
+        if (not 1 <= page_num <= self.total_pages or cache_key in self._preview_cache or
+                cache_key in self._prefetching):
+            return
+        
+        doc = self.doc
+        self._prefetching.add(cache_key)
+        future = self._executor.submit(self._render_page, doc, page_num, 600, 600)
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._apply_pixmap, f, doc, cache_key))
+        
+    def _schedule_render(self):
+        # Render 50 ms after the last navigation click so skipped pages never render
+        if self._render_after is not None:
+            self.root.after_cancel(self._render_after)
+        self._render_after = self.root.after(50, self._maybe_render)
+        
+    def _maybe_render(self):
+        self._render_after = None
+        self.update_preview()
             
     def prev_page(self):
         if self.current_preview_page > 1:
             self.current_preview_page -= 1
-            self.update_preview()
+            self._schedule_render()
             
     def next_page(self):
         if self.current_preview_page < self.total_pages:
             self.current_preview_page += 1
-            self.update_preview()
+            self._schedule_render()
             
     def add_range(self):
-        try:
-            start = int(self.start_page_var.get())
-            end = int(self.end_page_var.get())
-            
-            if start < 1 or end > self.total_pages or start > end:
-                raise ValueError
-                
-            range_str = f"Pages {start} to {end}"
-            self.page_ranges.append((start, end))
-            self.ranges_listbox.insert(tk.END, range_str)
-            
-            self.start_page_var.set("")
-            self.end_page_var.set("")
-            
-        except ValueError:
+        # Only plain decimal digits are accepted: no sign or underscores
+        start_str = self.start_page_var.get().strip()
+        end_str = self.end_page_var.get().strip()
+        if not (start_str.isdecimal() and end_str.isdecimal()):
             messagebox.showerror("Error", "Please enter valid page numbers")
+            return
+        
+        start = int(start_str)
+        end = int(end_str)
+        if start < 1 or end > self.total_pages or start > end:
+            messagebox.showerror("Error", "Please enter valid page numbers")
+            return
+            
+        self.page_ranges.append((start, end))
+        self.ranges_listbox.insert(tk.END, self._format_range(start, end))
+        
+        self.start_page_var.set("")
+        self.end_page_var.set("")
             
     def remove_range(self):
         selection = self.ranges_listbox.curselection()
@@ -204,6 +335,21 @@ class PDFSplitterGUI:
             self.ranges_listbox.delete(index)
             self.page_ranges.pop(index)
             
+    def _optimized_ranges(self):
+        # Ranges listed in page order can be merged where they overlap or touch.
+        # Any other order is the user's chosen sequence: only back-to-back ranges
+        # that continue each other (5-8 then 9-12) are joined, so each contiguous
+        # block is copied with a single insert_pdf call.
+        in_order = self.page_ranges == sorted(self.page_ranges)
+        
+        merged = []
+        for start, end in self.page_ranges:
+            if merged and (start <= merged[-1][1] + 1 if in_order else start == merged[-1][1] + 1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+            
     def export_pdf(self):
         if not self.page_ranges:
             messagebox.showerror("Error", "No page ranges selected")
@@ -213,15 +359,17 @@ class PDFSplitterGUI:
                                                   filetypes=[("PDF files", "*.pdf")])
         if output_path:
             try:
-                pdf_reader = PdfReader(self.current_pdf_path)
-                pdf_writer = PdfWriter()
-                
-                for start, end in self.page_ranges:
-                    for page_num in range(start - 1, end):
-                        pdf_writer.add_page(pdf_reader.pages[page_num])
-                
-                with open(output_path, 'wb') as output_file:
-                    pdf_writer.write(output_file)
+                # Copy straight from the open document; garbage=3+ could
+                # corrupt images MuPDF still has cached for self.doc
+                with _fitz_lock:
+                    out = fitz.open()
+                    try:
+                        for start, end in self._optimized_ranges():
+                            out.insert_pdf(self.doc, from_page=start - 1, to_page=end - 1)
+                        out.save(output_path, garbage=2, deflate=True)
+                    finally:
+                        # Release the output document even if a copy or the save fails
+                        out.close()
                     
                 messagebox.showinfo("Success", "PDF exported successfully!")
                 